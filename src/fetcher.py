@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import shutil
 import sqlite3
+import threading
 from pathlib import Path
 from typing import Any, Callable
 
@@ -18,6 +19,10 @@ class WordNotFoundError(WiktionaryError):
 class WiktionaryFetcher:
     def __init__(self, dictionary: str, base_dir: Path):
         self.db_path = base_dir / f"{dictionary}.db"
+        # Parsed word records, so that the getters below share a single lookup per word
+        self._word_cache: dict[str, dict] = {}
+        # Guards the connection and the cache when the fetcher is shared by worker threads
+        self._lock = threading.Lock()
         self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
         self._connection.executescript(
             """
@@ -30,6 +35,7 @@ class WiktionaryFetcher:
         )
 
     def close(self) -> None:
+        self._word_cache.clear()
         self._connection.close()
 
     def __enter__(self) -> WiktionaryFetcher:
@@ -84,12 +90,17 @@ class WiktionaryFetcher:
 
     def get_word_json(self, word: str) -> dict:
         # TODO: handle words with multiple word senses
-        row = self._connection.execute(
-            "SELECT data FROM words WHERE word = ?", (word,)
-        ).fetchone()
-        if not row:
-            raise WordNotFoundError(f'"{word}" was not found in the dictionary.')
-        return json.loads(row[0])
+        with self._lock:
+            if word in self._word_cache:
+                return self._word_cache[word]
+            row = self._connection.execute(
+                "SELECT data FROM words WHERE word = ?", (word,)
+            ).fetchone()
+            if not row:
+                raise WordNotFoundError(f'"{word}" was not found in the dictionary.')
+            data = json.loads(row[0])
+            self._word_cache[word] = data
+            return data
 
     def get_senses(self, word: str) -> list[str]:
         data = self.get_word_json(word)
@@ -15,6 +15,7 @@ from aqt.utils import getFile, openLink, showWarning, tooltip
 from ..consts import consts
 from ..fetcher import WiktionaryFetcher
 from ..gui.dialog import Dialog
+from ..utils import invalidate_dicts_cache
 
 if TYPE_CHECKING or qtmajor > 5:
     from ..forms.importer_qt6 import Ui_Dialog
@@ -91,6 +92,8 @@ The imported dictionary will be made available for use in the add-on's main dial
 
         def on_done(future: Future) -> None:
             self.mw.progress.finish()
+            # The database file is created even if importing fails midway
+            invalidate_dicts_cache()
             try:
                 count = future.result()
             except Exception as exc:
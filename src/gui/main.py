@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import contextlib
+import functools
 import os
 import time
-from typing import TYPE_CHECKING, Any, Callable
-from urllib.parse import unquote
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+from urllib.parse import unquote, urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
 
 try:
     from anki.utils import strip_html
@@ -13,10 +17,11 @@ except ImportError:
     from anki.utils import stripHTML as strip_html  # type: ignore
 
 from anki.notes import Note
+from anki.utils import pointVersion
 from aqt import qtmajor
 from aqt.main import AnkiQt
 from aqt.operations import QueryOp
-from aqt.qt import QDialog, QKeySequence, QPixmap, QWidget, qconnect
+from aqt.qt import QComboBox, QDialog, QKeySequence, QPixmap, QWidget, qconnect
 from aqt.utils import showWarning
 
 from ..consts import consts
@@ -30,12 +35,44 @@ else:
     from ..forms.main_qt5 import Ui_Dialog
 
 
+T = TypeVar("T")
+
 PROGRESS_LABEL = "Updated {count} out of {total} note(s)"
+# Minimum number of seconds between progress updates posted to the main thread
+PROGRESS_INTERVAL = 0.1
+# Number of notes filled concurrently; mostly bound by audio downloads
+MAX_WORKERS = 8
+COMBO_MIN_CONTENTS_LENGTH = 16
+
+
+def _create_http_session() -> requests.Session:
+    http_session = requests.Session()
+    # https://meta.wikimedia.org/wiki/User-Agent_policy
+    http_session.headers.update(
+        {
+            "User-Agent": "Mozilla/5.0 (compatible; Anki Wiktionary add-on, https://github.com/s03311251/anki-wiktionary)"
+        }
+    )
+    # Keep enough pooled connections for all fill workers
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_WORKERS * 2)
+    http_session.mount("https://", adapter)
+    http_session.mount("http://", adapter)
+    return http_session
+
+
+def _index_by_lowercase_name(names: list[str]) -> dict[str, int]:
+    """Map lowercased combo box items to their first index."""
+    indices: dict[str, int] = {}
+    for i, name in enumerate(names):
+        indices.setdefault(name.lower(), i)
+    return indices
 
 
 # pylint: disable=too-many-instance-attributes
 class WiktionaryFetcherDialog(Dialog):
     key = "fetcher"
+    # Loaded lazily and shared by all dialog instances
+    _pixmap_cache: dict[str, QPixmap] = {}
 
     def __init__(
         self,
@@ -47,6 +84,7 @@ class WiktionaryFetcherDialog(Dialog):
         super().__init__(parent)
         self.config = mw.addonManager.getConfig(__name__)
         self.notes = notes
+        self._http_session: requests.Session | None = None
 
     def setup_ui(self) -> None:
         self.form = Ui_Dialog()
@@ -62,25 +100,38 @@ class WiktionaryFetcherDialog(Dialog):
             self.form.etymologyFieldComboBox,
             self.form.declensionFieldComboBox,
         ]
+        # Size combos by a fixed number of characters instead of measuring every item
+        for combo in (self.form.dictionaryComboBox, *self.combos):
+            combo.setSizeAdjustPolicy(
+                QComboBox.SizeAdjustPolicy.AdjustToMinimumContentsLengthWithIcon
+            )
+            combo.setMinimumContentsLength(COMBO_MIN_CONTENTS_LENGTH)
         self.setWindowTitle(consts.name)
         self.form.icon.setPixmap(
-            QPixmap(os.path.join(consts.icons_dir, "enwiktionary-1.5x.png"))
+            self._get_pixmap(os.path.join(consts.icons_dir, "enwiktionary-1.5x.png"))
         )
-        self.form.dictionaryComboBox.addItems(get_dict_names())
-        self.downloader: WiktionaryFetcher | None = None
+        self.dict_names = get_dict_names()
+        self.form.dictionaryComboBox.addItems(self.dict_names)
         qconnect(self.form.addButton.clicked, self.on_add)
         self.form.addButton.setShortcut(QKeySequence("Ctrl+Return"))
         qconnect(self.finished, self.on_finished)
         super().setup_ui()
 
+    @classmethod
+    def _get_pixmap(cls, path: str) -> QPixmap:
+        pixmap = cls._pixmap_cache.get(path)
+        if pixmap is None:
+            pixmap = cls._pixmap_cache[path] = QPixmap(path)
+        return pixmap
+
     def exec(self) -> int:
         if self._fill_fields():
             return super().exec()
         return QDialog.DialogCode.Rejected  # pylint: disable=no-member
 
     def _fill_fields(self) -> int:
-        mids = {note.mid for note in self.notes}
-        if len(mids) > 1:
+        first_mid = self.notes[0].mid
+        if any(note.mid != first_mid for note in self.notes):
             showWarning(
                 "Please select notes from only one notetype.",
                 parent=self,
@@ -96,9 +147,7 @@ class WiktionaryFetcherDialog(Dialog):
             combo.setCurrentIndex(selected)
             qconnect(
                 combo.currentIndexChanged,
-                lambda field_index, combo_index=i: self.on_selected_field_changed(
-                    combo_index, field_index
-                ),
+                functools.partial(self.on_selected_field_changed, i),
             )
         self.set_last_used_settings()
         return 1
@@ -116,20 +165,16 @@ class WiktionaryFetcherDialog(Dialog):
     )
 
     def set_last_used_settings(self) -> None:
-        dictionary = self.config["dictionary_field"].lower()
-        for i in range(self.form.dictionaryComboBox.count()):
-            text = self.form.dictionaryComboBox.itemText(i)
-            if text.lower() == dictionary:
-                self.form.dictionaryComboBox.setCurrentIndex(i)
-                break
+        dict_indices = _index_by_lowercase_name(self.dict_names)
+        dict_index = dict_indices.get(self.config["dictionary_field"].lower())
+        if dict_index is not None:
+            self.form.dictionaryComboBox.setCurrentIndex(dict_index)
+        # All field combos share the same items
+        field_indices = _index_by_lowercase_name(self.field_names)
         for i, field_opt in enumerate(self.CONFIG_MODEL_FIELDS):
-            field_name = self.config[field_opt].lower()
-            combo = self.combos[i]
-            for i in range(combo.count()):
-                text = combo.itemText(i)
-                if text.lower() == field_name:
-                    combo.setCurrentIndex(i)
-                    break
+            field_index = field_indices.get(self.config[field_opt].lower())
+            if field_index is not None:
+                self.combos[i].setCurrentIndex(field_index)
 
     def save_settings(self) -> None:
         self.config["dictionary_field"] = self.form.dictionaryComboBox.currentText()
@@ -167,16 +212,24 @@ class WiktionaryFetcherDialog(Dialog):
         audio_field_i = self.form.audioFieldComboBox.currentIndex()
         etymology_field_i = self.form.etymologyFieldComboBox.currentIndex()
         declension_field_i = self.form.declensionFieldComboBox.currentIndex()
-        field_tuples = (
-            (definition_field_i, self._get_definitions),
-            (example_field_i, self._get_examples),
-            (gender_field_i, self._get_gender),
-            (pos_field_i, self._get_part_of_speech),
-            (ipa_field_i, self._get_ipa),
-            (audio_field_i, self._get_audio),
-            (etymology_field_i, self._get_etymology),
-            (declension_field_i, self._get_declension),
-        )
+        # Only needed for downloading audio files
+        if audio_field_i:
+            self._http_session = _create_http_session()
+        # Resolve the names of the selected fields once, skipping unselected ones
+        active_fields = [
+            (self.field_names[field_index], getter)
+            for field_index, getter in (
+                (definition_field_i, self._get_definitions),
+                (example_field_i, self._get_examples),
+                (gender_field_i, self._get_gender),
+                (pos_field_i, self._get_part_of_speech),
+                (ipa_field_i, self._get_ipa),
+                (audio_field_i, self._get_audio),
+                (etymology_field_i, self._get_etymology),
+                (declension_field_i, self._get_declension),
+            )
+            if field_index
+        ]
 
         def on_success(ret: Any) -> None:
             self.accept()
@@ -191,11 +244,15 @@ class WiktionaryFetcherDialog(Dialog):
             op=lambda col: self._fill_notes(
                 dictionary_name,
                 word_field,
-                field_tuples,
+                active_fields,
             ),
             success=on_success,
         )
         op.failure(on_failure)
+        # Notes are only modified in memory here and saved by the caller,
+        # so there's no need to block other collection operations
+        if pointVersion() >= 231000:
+            op = op.without_collection()
         op.run_in_background()
         self.mw.progress.start(
             max=len(self.notes),
@@ -209,59 +266,114 @@ class WiktionaryFetcherDialog(Dialog):
         self,
         dictionary_name: str,
         word_field: str,
-        field_tuples: tuple[tuple[int, Callable[[WiktionaryFetcher, str], str]], ...],
+        active_fields: list[tuple[str, Callable[[WiktionaryFetcher, str], str]]],
     ) -> None:
         want_cancel = False
         last_progress = 0.0
         self.errors = []
         self.updated_notes: list[Note] = []
+        self._progress_pending = False
+        total = len(self.notes)
+        updated_count = 0
 
         def on_progress() -> None:
             nonlocal want_cancel
+            self._progress_pending = False
             want_cancel = self.mw.progress.want_cancel()
             self.mw.progress.update(
-                label=PROGRESS_LABEL.format(
-                    count=len(self.updated_notes), total=len(self.notes)
-                ),
-                value=len(self.updated_notes),
-                max=len(self.notes),
+                label=PROGRESS_LABEL.format(count=updated_count, total=total),
+                value=updated_count,
+                max=total,
             )
 
-        with WiktionaryFetcher(dictionary_name, consts.dicts_dir) as fetcher:
+        # The executor exits first, so the HTTP session is only closed once
+        # running downloads have finished
+        with self._http_session or contextlib.nullcontext(), WiktionaryFetcher(
+            dictionary_name, consts.dicts_dir
+        ) as fetcher, ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures: dict[Future, Note] = {}
             for note in self.notes:
-                word = strip_html(note[word_field]).strip()
+                word = note[word_field]
+                # Most word fields are plain text, for which stripping is a no-op
+                if "<" in word or "&" in word:
+                    word = strip_html(word)
+                word = word.strip()
                 if not word:
                     continue
-                need_updating = False
-                try:
-                    for field_tuple in field_tuples:
-                        if not field_tuple[0]:
-                            continue
-                        contents = field_tuple[1](fetcher, word)
-                        note[self.field_names[field_tuple[0]]] = contents
-                        need_updating = True
-                except WordNotFoundError as exc:
-                    self.errors.append(str(exc))
-                finally:
-                    if need_updating:
-                        self.updated_notes.append(note)
-                    if time.time() - last_progress >= 0.01:
-                        self.mw.taskman.run_on_main(on_progress)
-                        last_progress = time.time()
-                if want_cancel:
-                    break
+                future = executor.submit(
+                    self._fill_note, fetcher, note, word, active_fields
+                )
+                futures[future] = note
+            try:
+                for future in as_completed(futures):
+                    try:
+                        if future.result():
+                            updated_count += 1
+                    except WordNotFoundError:
+                        pass
+                    finally:
+                        if (
+                            not self._progress_pending
+                            and time.monotonic() - last_progress >= PROGRESS_INTERVAL
+                        ):
+                            self._progress_pending = True
+                            self.mw.taskman.run_on_main(on_progress)
+                            last_progress = time.monotonic()
+                    if want_cancel:
+                        break
+            finally:
+                # Don't wait for pending notes after cancellation or an error
+                for future in futures:
+                    future.cancel()
+        self._collect_results(futures)
         self.mw.taskman.run_on_main(self.mw.progress.finish)
 
+    def _collect_results(self, futures: dict[Future, Note]) -> None:
+        """Record updated notes and errors in the order the notes were selected."""
+        for future, note in futures.items():
+            if future.cancelled():
+                continue
+            try:
+                if future.result():
+                    self.updated_notes.append(note)
+            except WordNotFoundError as exc:
+                self.errors.append(str(exc))
+
+    def _fill_note(
+        self,
+        fetcher: WiktionaryFetcher,
+        note: Note,
+        word: str,
+        active_fields: list[tuple[str, Callable[[WiktionaryFetcher, str], str]]],
+    ) -> bool:
+        """Fill the selected fields of a single note. Runs in a worker thread.
+        Returns whether the note was modified."""
+        for field_name, getter in active_fields:
+            note[field_name] = getter(fetcher, word)
+        return bool(active_fields)
+
+    def _run_on_main_and_wait(self, func: Callable[[], T]) -> T:
+        """Run func on the main thread and block the calling worker thread
+        until it returns."""
+        future: Future[T] = Future()
+
+        def run() -> None:
+            try:
+                future.set_result(func())
+            except Exception as exc:
+                future.set_exception(exc)
+
+        self.mw.taskman.run_on_main(run)
+        return future.result()
+
     def _get_definitions(self, fetcher: WiktionaryFetcher, word: str) -> str:
         defs = fetcher.get_senses(word)
         if len(defs) == 0:
             return ""
         if len(defs) == 1:
             return defs[0]
-        formatted = "<ul>"
-        formatted += "".join(f"<li>{definition}</li>" for definition in defs)
-        formatted += "</ul>"
-        return formatted
+        items = "".join(f"<li>{definition}</li>" for definition in defs)
+        return f"<ul>{items}</ul>"
 
     def _get_examples(self, fetcher: WiktionaryFetcher, word: str) -> str:
         examples = fetcher.get_examples(word)
@@ -269,10 +381,8 @@ class WiktionaryFetcherDialog(Dialog):
             return ""
         if len(examples) == 1:
             return examples[0]
-        formatted = "<ul>"
-        formatted += "".join(f"<li>{example}</li>" for example in examples)
-        formatted += "</ul>"
-        return formatted
+        items = "".join(f"<li>{example}</li>" for example in examples)
+        return f"<ul>{items}</ul>"
 
     def _get_gender(self, fetcher: WiktionaryFetcher, word: str) -> str:
         return fetcher.get_gender(word)
@@ -285,19 +395,20 @@ class WiktionaryFetcherDialog(Dialog):
 
     def _get_audio(self, fetcher: WiktionaryFetcher, word: str) -> str:
         url = fetcher.get_audio_url(word)
-
-        http_session = requests.Session()
-        # https://meta.wikimedia.org/wiki/User-Agent_policy
-        headers = {
-            "User-Agent": "Mozilla/5.0 (compatible; Anki Wiktionary add-on, https://github.com/s03311251/anki-wiktionary)"
-        }
+        if not url:
+            return ""
         try:
-            with http_session.get(url, headers=headers, timeout=30) as response:
+            with self._http_session.get(url, timeout=30) as response:
                 response.raise_for_status()
                 data = response.content
         except Exception:
             return ""
-        filename = self.mw.col.media.write_data(unquote(os.path.basename(url)), data)
+        # The collection must only be accessed from the main thread
+        filename = self._run_on_main_and_wait(
+            lambda: self.mw.col.media.write_data(
+                unquote(os.path.basename(urlsplit(url).path)), data
+            )
+        )
         return "[sound:" + filename + "]"
 
     def _get_etymology(self, fetcher: WiktionaryFetcher, word: str) -> str:
@@ -307,8 +418,7 @@ class WiktionaryFetcherDialog(Dialog):
         declensions = fetcher.get_declension(word)
         if len(declensions) == 0:
             return ""
-        formatted = "<ul>"
-        for key, value in declensions.items():
-            formatted += f"<li>{key}: {', '.join(value)}</li>"
-        formatted += "</ul>"
-        return formatted
+        items = "".join(
+            f"<li>{key}: {', '.join(value)}</li>" for key, value in declensions.items()
+        )
+        return f"<ul>{items}</ul>"
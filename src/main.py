@@ -17,6 +17,8 @@ from .gui.importer import ImportDictionaryDialog
 from .gui.main import WiktionaryFetcherDialog
 from .migration import migrate_legacy_dicts
 
+UPDATE_NOTES_CHUNK_SIZE = 1000
+
 
 def on_bulk_updated_notes(
     browser: Browser, errors: list[str], updated_count: int
@@ -43,7 +45,9 @@ def on_browser_action_triggered(browser: Browser) -> None:
             pos = col.add_custom_undo_entry(
                 f"Fill {len(updated_notes)} notes with data from Wiktionary"
             )
-            col.update_notes(updated_notes)
+            # Write in chunks to bound the size of each backend request
+            for i in range(0, len(updated_notes), UPDATE_NOTES_CHUNK_SIZE):
+                col.update_notes(updated_notes[i : i + UPDATE_NOTES_CHUNK_SIZE])
             return col.merge_undo_entries(pos)
 
         CollectionOp(
@@ -6,7 +6,7 @@ from aqt.utils import tooltip
 
 from .consts import consts
 from .fetcher import WiktionaryFetcher
-from .utils import get_legacy_dict_dirs
+from .utils import get_legacy_dict_dirs, invalidate_dicts_cache
 
 
 def migrate_legacy_dicts() -> None:
@@ -17,6 +17,7 @@ def migrate_legacy_dicts() -> None:
             WiktionaryFetcher.migrate_dict_to_sqlite(dict_dir, consts.dicts_dir)
 
     def success(_: None) -> None:
+        invalidate_dicts_cache()
         tooltip("Migrated Wiktionary dictionaries successfully")
 
     if legacy_dicts:
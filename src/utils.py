@@ -1,21 +1,37 @@
 from __future__ import annotations
 
+import functools
+import os
 from pathlib import Path
 
 from .consts import consts
 
 
 def get_legacy_dict_dirs() -> list[Path]:
-    return [
-        p
-        for p in consts.userfiles_dir.iterdir()
-        if p.is_dir() and p.name not in ("logs", consts.dicts_dir.name)
-    ]
+    with os.scandir(consts.userfiles_dir) as entries:
+        return [
+            Path(entry.path)
+            for entry in entries
+            if entry.is_dir() and entry.name not in ("logs", consts.dicts_dir.name)
+        ]
 
 
 def get_dicts() -> list[Path]:
-    return [p for p in (consts.dicts_dir).iterdir() if p.is_file()]
+    # The directory's mtime changes whenever a dictionary is added or removed,
+    # including manually, which makes the cached listing stale
+    return _get_dicts(consts.dicts_dir.stat().st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_dicts(mtime_ns: int) -> list[Path]:
+    with os.scandir(consts.dicts_dir) as entries:
+        return [Path(entry.path) for entry in entries if entry.is_file()]
 
 
 def get_dict_names() -> list[str]:
     return [p.stem for p in get_dicts()]
+
+
+def invalidate_dicts_cache() -> None:
+    """Should be called after adding or removing dictionaries."""
+    _get_dicts.cache_clear()
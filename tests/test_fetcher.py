@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from src.fetcher import WiktionaryFetcher, WordNotFoundError
+
+TEST_DICT = Path(__file__).parent / "test_dict.json"
+WORDS = ("кошка", "собака")
+
+
+@pytest.fixture
+def dict_dir(tmp_path: Path) -> Path:
+    WiktionaryFetcher.import_kaikki_dict(
+        TEST_DICT,
+        "dict",
+        on_progress=lambda *args, **kwargs: True,
+        on_error=lambda *args, **kwargs: None,
+        base_dir=tmp_path,
+    )
+    return tmp_path
+
+
+def lookup_all(fetcher: WiktionaryFetcher, word: str) -> tuple:
+    return (
+        fetcher.get_senses(word),
+        fetcher.get_examples(word),
+        fetcher.get_gender(word),
+        fetcher.get_part_of_speech(word),
+        fetcher.get_ipa(word),
+        fetcher.get_audio_url(word),
+        fetcher.get_etymology(word),
+        fetcher.get_declension(word),
+    )
+
+
+def test_missing_word_is_not_cached(tmp_path: Path) -> None:
+    line = TEST_DICT.read_text(encoding="utf-8").splitlines()[0]
+    with WiktionaryFetcher("dict", base_dir=tmp_path) as fetcher:
+        with pytest.raises(WordNotFoundError):
+            fetcher.get_senses("кошка")
+        fetcher._add_word("кошка", line)
+        assert fetcher.get_senses("кошка")[0] == "cat"
+
+
+def test_lookup_after_reopening(dict_dir: Path) -> None:
+    with WiktionaryFetcher("dict", base_dir=dict_dir) as fetcher:
+        expected = [lookup_all(fetcher, word) for word in WORDS]
+    with WiktionaryFetcher("dict", base_dir=dict_dir) as fetcher:
+        assert [lookup_all(fetcher, word) for word in WORDS] == expected
+
+
+def test_concurrent_lookups(dict_dir: Path) -> None:
+    with WiktionaryFetcher("dict", base_dir=dict_dir) as fetcher:
+        expected = {word: lookup_all(fetcher, word) for word in WORDS}
+    words = WORDS * 50
+    with WiktionaryFetcher("dict", base_dir=dict_dir) as fetcher:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda word: lookup_all(fetcher, word), words))
+    assert results == [expected[word] for word in words]